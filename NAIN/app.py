@@ -3,6 +3,7 @@ from __future__ import annotations
 import atexit
 import math
 import queue
+import sys
 import threading
 import time
 from pathlib import Path
@@ -11,11 +12,17 @@ from typing import Dict, Generator, List, Optional
 import cv2
 import numpy as np
 import pyttsx3
-from flask import Flask, Response, jsonify, render_template
+from flask import Flask, Response, jsonify, render_template, request
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Shared helpers live in the repository root next to the other Python services
+sys.path.insert(0, str(BASE_DIR.parent))
+from check_setup import load_calibration  # noqa: E402
+from detection_format import NAIN_DETECTIONS_MIMETYPE, encode_nain_detections, prefers_binary  # noqa: E402
 
 app = Flask(__name__)
 
-BASE_DIR = Path(__file__).resolve().parent
 CLASS_FILE = BASE_DIR / 'coco.names'
 CONFIG_PATH = BASE_DIR / 'ssd_mobilenet_v3_large_coco_2020_01_14.pbtxt'
 WEIGHTS_PATH = BASE_DIR / 'frozen_inference_graph.pb'
@@ -27,6 +34,10 @@ KNOWN_WIDTH_CM = 20.0
 SPEECH_COOLDOWN_SECONDS = 3.0
 DANGER_DISTANCE_CM = 150.0
 
+CALIBRATION = load_calibration('nain')
+if CALIBRATION.get('opencv_threads'):
+    cv2.setNumThreads(int(CALIBRATION['opencv_threads']))
+
 # Avoid reloading model for each request
 CLASS_NAMES = CLASS_FILE.read_text(encoding='utf-8').strip().splitlines()
 NET = cv2.dnn_DetectionModel(str(WEIGHTS_PATH), str(CONFIG_PATH))  # type: ignore[attr-defined]
@@ -190,7 +201,13 @@ def video_feed() -> Response:
 def latest_detections() -> Response:
     with results_lock:
         data = [dict(item) for item in latest_results]
-    return jsonify({'detections': data})
+
+    if prefers_binary(request.accept_mimetypes, NAIN_DETECTIONS_MIMETYPE):
+        response = Response(encode_nain_detections(data), mimetype=NAIN_DETECTIONS_MIMETYPE)
+    else:
+        response = jsonify({'detections': data})
+    response.vary.add('Accept')
+    return response
 
 
 @atexit.register
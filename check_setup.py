@@ -1,12 +1,46 @@
 """
 Vera Navigator - System Check
 Verifies all dependencies and services are properly configured
+
+Run with --calibrate to benchmark this host and write calibration.json,
+which the YOLOv8, Whisper and NAIN services read at startup.
 """
 
 import sys
+import argparse
 import importlib
+import json
+import math
+import multiprocessing
 import os
+import platform
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+from queue import Empty
+
+BASE_DIR = Path(__file__).resolve().parent
+CALIBRATION_FILE = os.environ.get('VERA_CALIBRATION_FILE', str(BASE_DIR / 'calibration.json'))
+SAMPLE_FRAME_DIR = BASE_DIR / 'src' / 'uploads' / 'detection'
+NAIN_DIR = BASE_DIR / 'NAIN'
+
+# Calibration grid, ordered from fastest/least accurate to slowest/most accurate
+YOLO_MODELS = ['yolov8n.pt', 'yolov8s.pt', 'yolov8m.pt']
+YOLO_INPUT_SIZES = [320, 416, 640]
+WHISPER_MODELS = ['tiny', 'base', 'small']
+
+# Targets used to turn benchmark numbers into recommendations
+YOLO_FRAME_BUDGET_MS = 100.0        # keep video frames at 10+ FPS
+WHISPER_MIN_REALTIME_FACTOR = 2.0   # transcribe at least twice as fast as real time
+THREAD_TOLERANCE = 1.05             # prefer fewer threads when within 5% of the fastest
+
+def load_calibration(section):
+    """Recommended settings for one service ('yolo', 'whisper', 'nain'), or {} without a usable file"""
+    try:
+        calibration = json.loads(Path(CALIBRATION_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return calibration.get('recommended', {}).get(section) or {}
 
 def check_python_version():
     """Check Python version"""
@@ -55,6 +89,354 @@ def check_env_var(var_name):
         print(f"⚠ {var_name} - Not set")
         return False
 
+def peak_memory_mb():
+    """Peak resident memory of the current process in MB, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+        return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+
+def thread_candidates():
+    """Thread counts worth trying on this host"""
+    cpu_count = os.cpu_count() or 1
+    return sorted({n for n in (1, 2, 4, cpu_count // 2, cpu_count) if 1 <= n <= cpu_count})
+
+def load_sample_frame(cv2, np):
+    """Load a bundled camera frame, falling back to a synthetic one"""
+    for path in sorted(SAMPLE_FRAME_DIR.glob('*.jpg')):
+        frame = cv2.imread(str(path))
+        if frame is not None:
+            return frame
+    return np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+def load_sample_audio(np, audio_path=None):
+    """Load the sample clip, or synthesize 10 seconds of tones and noise at 16 kHz (timing only)"""
+    if audio_path:
+        import whisper
+        return whisper.load_audio(audio_path)
+
+    sample_rate = 16000
+    t = np.arange(10 * sample_rate) / sample_rate
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 3 * t))  # ~3 syllables per second
+    tone = np.sin(2 * np.pi * 180 * t) + 0.5 * np.sin(2 * np.pi * 720 * t)
+    noise = np.random.default_rng(0).normal(0, 0.02, t.shape)
+    return (0.2 * envelope * tone + noise).astype(np.float32)
+
+def bench_yolo(model_name, input_size, threads, iterations):
+    """Time YOLOv8 inference on a frame resized to input_size"""
+    import cv2
+    import numpy as np
+    import torch
+    from ultralytics import YOLO
+
+    torch.set_num_threads(threads)
+    model = YOLO(model_name)
+    frame = cv2.resize(load_sample_frame(cv2, np), (input_size, input_size))
+    model(frame, imgsz=input_size, verbose=False)  # warm-up
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        model(frame, imgsz=input_size, conf=0.35, iou=0.45, verbose=False)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, {}
+
+def bench_whisper(model_name, threads, iterations, audio_path):
+    """Time a full Whisper transcription of the sample clip"""
+    import numpy as np
+    import torch
+    import whisper
+
+    torch.set_num_threads(threads)
+    model = whisper.load_model(model_name)
+    audio = load_sample_audio(np, audio_path)
+    options = {
+        'language': 'en',
+        'fp16': torch.cuda.is_available(),
+        'temperature': 0.0,
+        'condition_on_previous_text': False
+    }
+    model.transcribe(audio[:16000 * 2], **options)  # warm-up
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        model.transcribe(audio, **options)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, {'audio_seconds': round(len(audio) / 16000, 2)}
+
+def bench_ssd(threads, iterations):
+    """Time NAIN's SSD MobileNet detector with a given OpenCV thread count"""
+    import cv2
+    import numpy as np
+
+    cv2.setNumThreads(threads)
+    net = cv2.dnn_DetectionModel(
+        str(NAIN_DIR / 'frozen_inference_graph.pb'),
+        str(NAIN_DIR / 'ssd_mobilenet_v3_large_coco_2020_01_14.pbtxt')
+    )
+    net.setInputSize(320, 320)
+    net.setInputScale(1.0 / 127.5)
+    net.setInputMean((127.5, 127.5, 127.5))
+    net.setInputSwapRB(True)
+    frame = cv2.resize(load_sample_frame(cv2, np), (640, 360))
+    net.detect(frame, confThreshold=0.45, nmsThreshold=0.2)  # warm-up
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        net.detect(frame, confThreshold=0.45, nmsThreshold=0.2)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, {}
+
+def _benchmark_worker(results, target, args):
+    """Child process entry point: run one benchmark and report timings and peak memory"""
+    try:
+        latencies, extra = target(*args)
+        results.put({'latencies_ms': latencies, 'peak_memory_mb': peak_memory_mb(), **extra})
+    except Exception as e:
+        results.put({'error': str(e)})
+
+def run_isolated(target, *args):
+    """Run a benchmark in a fresh process so each model's memory is measured on its own"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_benchmark_worker, args=(results, target, args))
+    process.start()
+
+    while True:
+        try:
+            result = results.get(timeout=1)
+            break
+        except Empty:
+            if not process.is_alive():
+                result = {'error': f'benchmark process exited with code {process.exitcode}'}
+                break
+    process.join()
+
+    if 'error' in result:
+        return result
+
+    latencies = sorted(result.pop('latencies_ms'))
+    mean_ms = sum(latencies) / len(latencies)
+    summary = {
+        'mean_ms': round(mean_ms, 2),
+        'p50_ms': round(latencies[len(latencies) // 2], 2),
+        'p95_ms': round(latencies[min(len(latencies) - 1, math.ceil(len(latencies) * 0.95) - 1)], 2),
+        'throughput_per_s': round(1000.0 / mean_ms, 2) if mean_ms > 0 else None,
+        'peak_memory_mb': round(result.pop('peak_memory_mb'), 1) if result.get('peak_memory_mb') else None
+    }
+    summary.update(result)
+    if 'audio_seconds' in summary:
+        summary['realtime_factor'] = round(summary['audio_seconds'] * 1000 / mean_ms, 2)
+    return summary
+
+def print_result(label, result):
+    """Print one benchmark line"""
+    if 'error' in result:
+        print(f"✗ {label} - {result['error']}")
+        return
+    memory = f"{result['peak_memory_mb']:.0f} MB" if result['peak_memory_mb'] else 'n/a'
+    print(f"✓ {label:<34} p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+          f"{result['throughput_per_s']:7.2f}/s  peak {memory}")
+
+def pick_threads(results):
+    """Fewest threads whose median latency is within THREAD_TOLERANCE of the fastest"""
+    ok = [r for r in results if 'error' not in r]
+    if not ok:
+        return None
+    fastest = min(r['p50_ms'] for r in ok)
+    return min(r['threads'] for r in ok if r['p50_ms'] <= fastest * THREAD_TOLERANCE)
+
+def sweep_threads(label, base, benchmark_for):
+    """Re-run the chosen configuration across thread_candidates(), reusing base for its own thread count"""
+    config = {k: v for k, v in base.items() if k in ('model', 'input_size')}
+    sweep = []
+    for threads in thread_candidates():
+        if threads == base['threads']:
+            sweep.append(base)
+            continue
+        result = run_isolated(*benchmark_for(threads))
+        result.update(config, threads=threads)
+        print_result(f"{label}, {threads} threads", result)
+        sweep.append(result)
+    return sweep
+
+def calibrate_yolo(quick):
+    """Benchmark YOLOv8 model sizes, input resolutions and torch thread counts"""
+    print("YOLOv8 (Object Detection):")
+    models = YOLO_MODELS[:1] if quick else YOLO_MODELS
+    sizes = YOLO_INPUT_SIZES[:2] if quick else YOLO_INPUT_SIZES
+    iterations = 5 if quick else 20
+    cpu_count = os.cpu_count() or 1
+
+    grid = []
+    for model_name in models:
+        for input_size in sizes:
+            result = run_isolated(bench_yolo, model_name, input_size, cpu_count, iterations)
+            result.update({'model': model_name, 'input_size': input_size, 'threads': cpu_count})
+            print_result(f"{model_name} @ {input_size}px", result)
+            grid.append(result)
+
+    ok = [r for r in grid if 'error' not in r]
+    if not ok:
+        print()
+        return None, grid
+
+    # Most accurate configuration that still meets the frame budget, else the fastest one
+    within_budget = [r for r in ok if r['p95_ms'] <= YOLO_FRAME_BUDGET_MS]
+    if within_budget:
+        best = max(within_budget, key=lambda r: (YOLO_MODELS.index(r['model']), r['input_size']))
+    else:
+        best = min(ok, key=lambda r: r['p50_ms'])
+
+    sweep = sweep_threads(
+        f"{best['model']} @ {best['input_size']}px", best,
+        lambda threads: (bench_yolo, best['model'], best['input_size'], threads, iterations)
+    )
+    print()
+
+    recommended = {
+        'model': best['model'],
+        'input_size': best['input_size'],
+        'threads': pick_threads(sweep)
+    }
+    return recommended, grid + [r for r in sweep if r is not best]
+
+def calibrate_whisper(quick, audio_path):
+    """Benchmark Whisper model sizes and torch thread counts on the sample clip"""
+    print("Whisper (Speech-to-Text):")
+    models = WHISPER_MODELS[:2] if quick else WHISPER_MODELS
+    iterations = 1 if quick else 3
+    cpu_count = os.cpu_count() or 1
+
+    results = []
+    for model_name in models:
+        result = run_isolated(bench_whisper, model_name, cpu_count, iterations, audio_path)
+        result.update({'model': model_name, 'threads': cpu_count})
+        print_result(f"whisper-{model_name}", result)
+        results.append(result)
+
+    ok = [r for r in results if 'error' not in r]
+    if not ok:
+        print()
+        return None, results
+
+    # Decode time on non-speech audio is not representative, so only a real clip drives a recommendation
+    if audio_path is None:
+        print("⚠ No --audio speech clip given: timings above use a synthetic clip, no Whisper settings recommended")
+        print()
+        return None, results
+
+    fast_enough = [r for r in ok if r['realtime_factor'] >= WHISPER_MIN_REALTIME_FACTOR]
+    if fast_enough:
+        best = max(fast_enough, key=lambda r: WHISPER_MODELS.index(r['model']))
+    else:
+        best = max(ok, key=lambda r: r['realtime_factor'])
+
+    sweep = sweep_threads(
+        f"whisper-{best['model']}", best,
+        lambda threads: (bench_whisper, best['model'], threads, iterations, audio_path)
+    )
+    print()
+
+    recommended = {'model': best['model'], 'threads': pick_threads(sweep)}
+    return recommended, results + [r for r in sweep if r is not best]
+
+def calibrate_nain(quick):
+    """Benchmark NAIN's SSD MobileNet detector across OpenCV thread counts"""
+    print("NAIN (SSD MobileNet):")
+    if not (NAIN_DIR / 'frozen_inference_graph.pb').exists():
+        print(f"✗ SSD weights - Not found at {NAIN_DIR / 'frozen_inference_graph.pb'}")
+        print()
+        return None, []
+
+    results = []
+    for threads in thread_candidates():
+        result = run_isolated(bench_ssd, threads, 10 if quick else 50)
+        result['threads'] = threads
+        print_result(f"{threads} OpenCV threads", result)
+        results.append(result)
+    print()
+
+    threads = pick_threads(results)
+    return ({'opencv_threads': threads} if threads else None), results
+
+def calibrate(output_path, quick=False, audio_path=None):
+    """Benchmark this host and write the recommended service settings"""
+    print("=" * 60)
+    print("  Vera Navigator - Hardware Calibration")
+    print("=" * 60)
+    print()
+
+    try:
+        import torch
+        cuda = torch.cuda.is_available()
+    except ImportError:
+        cuda = False
+
+    if peak_memory_mb() is None:
+        print("⚠ Peak memory can't be measured on this host - install psutil (pip install psutil)")
+        print()
+
+    recommended = {}
+    benchmarks = {}
+    for section, (settings, results) in (
+        ('yolo', calibrate_yolo(quick)),
+        ('whisper', calibrate_whisper(quick, audio_path)),
+        ('nain', calibrate_nain(quick))
+    ):
+        benchmarks[section] = results
+        if settings:
+            recommended[section] = settings
+
+    calibration = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'cuda': cuda
+        },
+        'recommended': recommended,
+        'benchmarks': benchmarks
+    }
+    Path(output_path).write_text(json.dumps(calibration, indent=2), encoding='utf-8')
+
+    print("=" * 60)
+    if not recommended:
+        print("✗ No benchmark completed, services will keep their defaults.")
+    else:
+        print("Recommended settings:")
+    for section, settings in recommended.items():
+        print(f"  {section}: " + ', '.join(f"{k}={v}" for k, v in settings.items()))
+    print(f"\n✓ Written to {output_path}")
+    print("  Restart the services to apply them.")
+    print("=" * 60)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Vera Navigator system check and hardware calibration')
+    parser.add_argument('--calibrate', action='store_true',
+                        help='benchmark this host and write recommended service settings')
+    parser.add_argument('--quick', action='store_true',
+                        help='calibrate with a smaller grid and fewer iterations')
+    parser.add_argument('--audio', help='speech clip for the Whisper benchmark')
+    parser.add_argument('--output', default=CALIBRATION_FILE,
+                        help=f'calibration file to write (default: {CALIBRATION_FILE})')
+    return parser.parse_args()
+
 def main():
     print("=" * 60)
     print("  Vera Navigator - System Check")
@@ -90,6 +472,7 @@ def main():
     print("Additional Dependencies:")
     all_ok &= check_module('numpy', 'NumPy')
     all_ok &= check_module('PIL', 'Pillow')
+    all_ok &= check_module('psutil', 'psutil')
     print()
     
     # Check for YAMNet model
@@ -115,6 +498,10 @@ def main():
         check_env_var('YOLO_SERVICE_URL')
     else:
         print("⚠ Create .env file from .env.example")
+    if Path(CALIBRATION_FILE).exists():
+        print(f"✓ Hardware calibration ({CALIBRATION_FILE})")
+    else:
+        print("⚠ No hardware calibration - run: python check_setup.py --calibrate")
     print()
     
     # Summary
@@ -130,4 +517,8 @@ def main():
     print("=" * 60)
 
 if __name__ == '__main__':
-    main()
+    args = parse_args()
+    if args.calibrate:
+        calibrate(args.output, quick=args.quick, audio_path=args.audio)
+    else:
+        main()
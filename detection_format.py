@@ -0,0 +1,174 @@
+"""
+Compact Binary Detection Format
+Shared encoders for the YOLOv8 service and NAIN detection endpoints
+
+JSON stays the default; clients opt in with the matching Accept header.
+All fields are little-endian and sections are ordered so each typed array stays aligned.
+
+YOLOv8 (application/x-veranav-detections):
+  header        4s magic 'VDET', uint8 version, uint8 class table size, uint16 count,
+                uint16 image width, uint16 image height, float32 processing time (NaN if absent)
+  boxes         count * 4 float32 (x, y, width, height)
+  scores        count uint16 (confidence * 65535)
+  class ids     count uint8, indexes into the class table below
+  class table   per class: uint8 byte length + UTF-8 name, each name sent once per response
+
+NAIN (application/x-nain-detections):
+  header        4s magic 'NDET', uint8 version, uint8 label table size, uint16 count
+  distances     count float32 centimeters (NaN when unknown)
+  scores        count uint16 (confidence * 65535)
+  label ids     count uint8, indexes into the label table below
+  flags         count uint8, bit 0 set when the object is close
+  label table   per label: uint8 byte length + UTF-8 label, each label sent once per response
+
+Run this file directly to compare payload size and serialization time against JSON.
+"""
+
+import argparse
+import json
+import math
+import random
+import struct
+import timeit
+
+VERANAV_DETECTIONS_MIMETYPE = 'application/x-veranav-detections'
+VERANAV_DETECTIONS_MAGIC = b'VDET'
+VERANAV_DETECTIONS_HEADER = struct.Struct('<4sBBHHHf')
+
+NAIN_DETECTIONS_MIMETYPE = 'application/x-nain-detections'
+NAIN_DETECTIONS_MAGIC = b'NDET'
+NAIN_DETECTIONS_HEADER = struct.Struct('<4sBBH')
+
+DETECTIONS_FORMAT_VERSION = 1
+
+
+def prefers_binary(accept_mimetypes, mimetype):
+    """Return True if the Accept header asks for the binary mimetype (JSON stays the default)"""
+    return accept_mimetypes.best_match(['application/json', mimetype]) == mimetype
+
+
+def _quantize_score(confidence):
+    """Map a 0-1 confidence onto the uint16 range"""
+    return int(round(min(max(float(confidence), 0.0), 1.0) * 65535))
+
+
+def _index_names(names):
+    """Deduplicate names into a table and return (per-item ids, packed table)"""
+    table = []
+    index = {}
+    ids = []
+    for name in names:
+        if name not in index:
+            index[name] = len(table)
+            table.append(name.encode('utf-8'))
+        ids.append(index[name])
+    packed = b''.join(bytes([len(encoded)]) + encoded for encoded in table)
+    return ids, len(table), packed
+
+
+def encode_veranav_detections(detections, image_size, processing_time=None):
+    """Pack YOLOv8 service detections (class_name, confidence, bbox) into the binary layout"""
+    count = len(detections)
+    class_ids, table_size, table = _index_names([d['class_name'] for d in detections])
+    boxes = [value for d in detections for value in d['bbox']]
+
+    header = VERANAV_DETECTIONS_HEADER.pack(
+        VERANAV_DETECTIONS_MAGIC,
+        DETECTIONS_FORMAT_VERSION,
+        table_size,
+        count,
+        image_size['width'],
+        image_size['height'],
+        math.nan if processing_time is None else processing_time
+    )
+
+    return b''.join([
+        header,
+        struct.pack(f'<{count * 4}f', *boxes),
+        struct.pack(f'<{count}H', *(_quantize_score(d['confidence']) for d in detections)),
+        bytes(class_ids),
+        table
+    ])
+
+
+def encode_nain_detections(detections):
+    """Pack NAIN detections (label, distance_cm, confidence, is_close) into the binary layout"""
+    count = len(detections)
+    label_ids, table_size, table = _index_names([str(d['label']) for d in detections])
+    distances = [math.nan if d['distance_cm'] is None else float(d['distance_cm']) for d in detections]
+
+    header = NAIN_DETECTIONS_HEADER.pack(NAIN_DETECTIONS_MAGIC, DETECTIONS_FORMAT_VERSION, table_size, count)
+
+    return b''.join([
+        header,
+        struct.pack(f'<{count}f', *distances),
+        struct.pack(f'<{count}H', *(_quantize_score(d['confidence']) for d in detections)),
+        bytes(label_ids),
+        bytes(1 if d['is_close'] else 0 for d in detections),
+        table
+    ])
+
+
+def _sample_detections(count, rng):
+    """Build synthetic YOLOv8 and NAIN detections shaped like the real endpoint output"""
+    names = ['person', 'car', 'bicycle', 'traffic light', 'dog', 'chair', 'bus', 'truck']
+    veranav = []
+    nain = []
+    for _ in range(count):
+        x, y = rng.uniform(0, 500), rng.uniform(0, 300)
+        w, h = rng.uniform(10, 200), rng.uniform(10, 200)
+        confidence = rng.uniform(0.4, 1.0)
+        name = rng.choice(names)
+        veranav.append({
+            'class_name': name,
+            'class_id': names.index(name),
+            'confidence': round(confidence, 3),
+            'bbox': [round(x, 2), round(y, 2), round(w, 2), round(h, 2)],
+            'box': [round(x, 2), round(y, 2), round(x + w, 2), round(y + h, 2)]
+        })
+        nain.append({
+            'label': name.capitalize(),
+            'distance_cm': round(rng.uniform(30, 500), 2),
+            'confidence': round(confidence, 4),
+            'is_close': confidence > 0.7
+        })
+    return veranav, nain
+
+
+def benchmark(counts=(5, 10, 25), number=2000):
+    """Print payload size and serialization time for JSON vs the binary formats"""
+    rng = random.Random(0)
+    image_size = {'width': 640, 'height': 480}
+
+    def to_json(payload):
+        # Matches Flask's jsonify outside debug mode: sorted keys, compact separators
+        return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    def measure(serialize):
+        seconds = min(timeit.repeat(serialize, number=number, repeat=5)) / number
+        return len(serialize()), seconds * 1e6
+
+    print(f"{'Detections':>10} | {'/detect JSON':>16} | {'/detect binary':>16} | "
+          f"{'NAIN JSON':>16} | {'NAIN binary':>16}")
+    for count in counts:
+        veranav, nain = _sample_detections(count, rng)
+        payload = {
+            'detections': veranav,
+            'count': count,
+            'processing_time': 0.042,
+            'image_size': image_size
+        }
+        cells = [
+            measure(lambda: to_json(payload)),
+            measure(lambda: encode_veranav_detections(veranav, image_size, 0.042)),
+            measure(lambda: to_json({'detections': nain})),
+            measure(lambda: encode_nain_detections(nain))
+        ]
+        print(f"{count:>10} | " + ' | '.join(f"{size:>6} B {micros:>6.1f} us" for size, micros in cells))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare JSON and binary detection payloads')
+    parser.add_argument('--number', type=int, default=2000, help='serializations per timing run')
+    args = parser.parse_args()
+    benchmark(number=args.number)
@@ -41,6 +41,9 @@ const upload = multer({
 // YOLOv8 detection service URL (runs separately via Python)
 const YOLO_SERVICE_URL = process.env.YOLO_SERVICE_URL || 'http://localhost:5002';
 
+// Compact binary detection format (see detection_format.py), passed through untouched
+const DETECTIONS_BINARY_MIMETYPE = 'application/x-veranav-detections';
+
 /**
  * Health check for detection service
  */
@@ -82,20 +85,32 @@ router.post('/detect', upload.single('image'), async (req, res) => {
       contentType: req.file.mimetype
     });
     
+    // Forward Accept so clients can negotiate the binary format with the service
+    const accept = req.get('Accept');
     const response = await axios.post(`${YOLO_SERVICE_URL}/detect`, formData, {
       headers: {
         ...formData.getHeaders(),
+        ...(accept ? { Accept: accept } : {}),
       },
+      responseType: 'arraybuffer',
       timeout: 10000, // 10 second timeout
     });
     
     // Clean up uploaded file
     await fs.unlink(filePath);
     
+    res.vary('Accept');
+    const contentType = response.headers['content-type'] || '';
+    if (contentType.startsWith(DETECTIONS_BINARY_MIMETYPE)) {
+      res.type(contentType);
+      return res.send(Buffer.from(response.data));
+    }
+    
+    const data = JSON.parse(Buffer.from(response.data).toString('utf8'));
     res.json({
-      detections: response.data.detections || [],
-      count: response.data.count || 0,
-      processing_time: response.data.processing_time
+      detections: data.detections || [],
+      count: data.count || 0,
+      processing_time: data.processing_time
     });
   } catch (error) {
     console.error('Error in object detection:', error.message);
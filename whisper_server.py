@@ -6,10 +6,13 @@ Uses OpenAI's Whisper model running locally for transcription
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import whisper
+import torch
 import tempfile
 import os
 import logging
 
+from check_setup import load_calibration
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,10 +20,15 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Load Whisper model (use 'base' for balance of speed and accuracy)
+CALIBRATION = load_calibration('whisper')
+if CALIBRATION.get('threads'):
+    torch.set_num_threads(int(CALIBRATION['threads']))
+
+# Load Whisper model (environment overrides calibration, 'base' balances speed and accuracy)
 # Models: tiny, base, small, medium, large
-logger.info("Loading Whisper model... This may take a minute on first run.")
-model = whisper.load_model("base")
+WHISPER_MODEL = os.environ.get('WHISPER_MODEL', CALIBRATION.get('model', 'base'))
+logger.info(f"Loading Whisper model '{WHISPER_MODEL}'... This may take a minute on first run.")
+model = whisper.load_model(WHISPER_MODEL)
 logger.info("✓ Whisper model loaded successfully")
 
 @app.route('/health', methods=['GET'])
@@ -28,7 +36,7 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'OK',
-        'model': 'whisper-base',
+        'model': f'whisper-{WHISPER_MODEL}',
         'service': 'Local Whisper Server'
     })
 
@@ -96,7 +104,7 @@ def transcribe_audio():
 def list_models():
     """List available Whisper models"""
     return jsonify({
-        'current_model': 'base',
+        'current_model': WHISPER_MODEL,
         'available_models': ['tiny', 'base', 'small', 'medium', 'large'],
         'model_info': {
             'tiny': 'Fastest, least accurate (~1GB RAM)',
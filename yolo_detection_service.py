@@ -3,20 +3,33 @@ YOLOv8 Object Detection Service
 Provides a REST API for real-time object detection using YOLOv8
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import cv2
 import numpy as np
 from ultralytics import YOLO
 import time
 import os
+import torch
 from pathlib import Path
 
+from check_setup import CALIBRATION_FILE, load_calibration
+from detection_format import VERANAV_DETECTIONS_MIMETYPE, encode_veranav_detections, prefers_binary
+
 app = Flask(__name__)
 CORS(app)
 
-# Load YOLOv8 model
-MODEL_PATH = os.environ.get('YOLO_MODEL_PATH', 'yolov8n.pt')  # nano model for speed
+CALIBRATION = load_calibration('yolo')
+if CALIBRATION.get('threads'):
+    torch.set_num_threads(int(CALIBRATION['threads']))
+
+# Frames from /detect-video-frame are resized to a square of this size before inference.
+# Only a calibrated size is also used as the inference size; otherwise ultralytics keeps its default.
+VIDEO_INPUT_SIZE = int(CALIBRATION.get('input_size', 416))
+VIDEO_INFERENCE_OPTIONS = {'imgsz': VIDEO_INPUT_SIZE} if 'input_size' in CALIBRATION else {}
+
+# Load YOLOv8 model (environment overrides calibration, nano model is the fallback for speed)
+MODEL_PATH = os.environ.get('YOLO_MODEL_PATH', CALIBRATION.get('model', 'yolov8n.pt'))
 print(f"Loading YOLOv8 model from {MODEL_PATH}...")
 
 try:
@@ -44,6 +57,21 @@ RELEVANT_CLASSES = [
     'toothbrush'
 ]
 
+def detections_response(payload, image_size):
+    """Serialize a detection payload as JSON or compact binary depending on the Accept header"""
+    if prefers_binary(request.accept_mimetypes, VERANAV_DETECTIONS_MIMETYPE):
+        body = encode_veranav_detections(
+            payload['detections'],
+            image_size,
+            payload.get('processing_time')
+        )
+        response = Response(body, mimetype=VERANAV_DETECTIONS_MIMETYPE)
+    else:
+        response = jsonify(payload)
+
+    response.vary.add('Accept')
+    return response
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -51,6 +79,7 @@ def health_check():
         'status': 'OK',
         'service': 'YOLOv8 Object Detection',
         'model': MODEL_PATH,
+        'video_input_size': VIDEO_INPUT_SIZE,
         'version': '1.0.0'
     })
 
@@ -59,6 +88,7 @@ def detect_objects():
     """
     Detect objects in an uploaded image
     Returns: JSON with detections, bounding boxes, and confidence scores
+    (or the compact binary format when requested via the Accept header)
     """
     start_time = time.time()
     
@@ -112,16 +142,17 @@ def detect_objects():
                     })
         
         processing_time = time.time() - start_time
+        image_size = {
+            'width': img.shape[1],
+            'height': img.shape[0]
+        }
         
-        return jsonify({
+        return detections_response({
             'detections': detections,
             'count': len(detections),
             'processing_time': round(processing_time, 3),
-            'image_size': {
-                'width': img.shape[1],
-                'height': img.shape[0]
-            }
-        })
+            'image_size': image_size
+        }, image_size)
     
     except Exception as e:
         print(f"Error during detection: {e}")
@@ -149,10 +180,10 @@ def detect_video_frame():
             return jsonify({'error': 'Invalid image file'}), 400
         
         # Resize for faster processing
-        img_resized = cv2.resize(img, (416, 416))
+        img_resized = cv2.resize(img, (VIDEO_INPUT_SIZE, VIDEO_INPUT_SIZE))
         
         # Run detection with lower confidence threshold
-        results = model(img_resized, conf=0.35, iou=0.45, verbose=False)
+        results = model(img_resized, conf=0.35, iou=0.45, verbose=False, **VIDEO_INFERENCE_OPTIONS)
         
         detections = []
         for result in results:
@@ -164,8 +195,8 @@ def detect_video_frame():
                 class_name = model.names[class_id]
                 
                 # Scale coordinates back to original size
-                scale_x = img.shape[1] / 416
-                scale_y = img.shape[0] / 416
+                scale_x = img.shape[1] / VIDEO_INPUT_SIZE
+                scale_y = img.shape[0] / VIDEO_INPUT_SIZE
                 
                 detections.append({
                     'class_name': class_name,
@@ -178,10 +209,10 @@ def detect_video_frame():
                     ]
                 })
         
-        return jsonify({
+        return detections_response({
             'detections': detections,
             'count': len(detections)
-        })
+        }, {'width': img.shape[1], 'height': img.shape[0]})
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -192,6 +223,9 @@ if __name__ == '__main__':
     print(f"  YOLOv8 Object Detection Service")
     print(f"  Running on http://localhost:{port}")
     print(f"  Model: {MODEL_PATH}")
+    print(f"  Video input size: {VIDEO_INPUT_SIZE}px")
+    if CALIBRATION:
+        print(f"  Calibration: {CALIBRATION_FILE}")
     print(f"{'='*60}\n")
     
     app.run(host='0.0.0.0', port=port, debug=False)